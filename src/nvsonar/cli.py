@@ -4,12 +4,30 @@ import sys
 
 import typer
 
+from nvsonar import __version__
+
 app = typer.Typer(add_completion=False)
 
 
+def _version_callback(value: bool) -> None:
+    """Print version and exit before the TUI stack is imported"""
+    if value:
+        typer.echo(f"nvsonar {__version__}")
+        raise typer.Exit()
+
+
 @app.command()
-def main():
+def main(
+    version: bool = typer.Option(
+        False,
+        "--version",
+        help="Show version and exit",
+        callback=_version_callback,
+        is_eager=True,
+    ),
+):
     """Launch GPU monitoring interface"""
+    # Textual, Rich and NVML bindings load only when the TUI actually starts
     try:
         from nvsonar.tui.app import App
 
@@ -37,6 +37,45 @@ class Analysis:
         return f"{self.bottleneck_type.value} ({self.confidence:.0f}% confidence)"
 
 
+def _classify_utilization(device_util: float, mem_util: float) -> tuple[BottleneckType, float]:
+    """Classify a workload from compute and memory utilization alone"""
+
+    # Heavy compute bound - GPU maxed out
+    if device_util > 90 and mem_util < 80:
+        return BottleneckType.COMPUTE_BOUND, 85.0
+
+    # Heavy memory bound - memory maxed out
+    if mem_util > 85 and device_util < 90:
+        return BottleneckType.MEMORY_BOUND, 80.0
+
+    # Balanced heavy workload
+    if device_util > 75 and mem_util > 70:
+        return BottleneckType.BALANCED, 70.0
+
+    # Moderate compute workload
+    if device_util >= 30 and mem_util < 50:
+        return BottleneckType.COMPUTE_BOUND, 60.0
+
+    # Moderate memory workload
+    if mem_util >= 40 and device_util < 60:
+        return BottleneckType.MEMORY_BOUND, 55.0
+
+    # Light balanced workload
+    if device_util >= 20 or mem_util >= 20:
+        return BottleneckType.BALANCED, 50.0
+
+    return BottleneckType.UNKNOWN, 30.0
+
+
+# Precomputed _classify_utilization results for every pair of integer percents.
+# Thresholds such as >85 and >75 do not fall on 10% boundaries, so the table
+# uses 1% steps to give exactly the same answers as the heuristic ladder.
+_BOTTLENECK_LUT = tuple(
+    tuple(_classify_utilization(device_util, mem_util) for mem_util in range(101))
+    for device_util in range(101)
+)
+
+
 class Analyzer:
     """Analyzes GPU metrics to detect bottlenecks"""
 
@@ -98,28 +137,8 @@ class Analyzer:
             if power_ratio > 0.95:
                 return BottleneckType.POWER_LIMITED, 85.0
 
-        # Heavy compute bound - GPU maxed out
-        if device_util > 90 and mem_util < 80:
-            return BottleneckType.COMPUTE_BOUND, 85.0
-
-        # Heavy memory bound - memory maxed out
-        if mem_util > 85 and device_util < 90:
-            return BottleneckType.MEMORY_BOUND, 80.0
-
-        # Balanced heavy workload
-        if device_util > 75 and mem_util > 70:
-            return BottleneckType.BALANCED, 70.0
-
-        # Moderate compute workload
-        if device_util >= 30 and mem_util < 50:
-            return BottleneckType.COMPUTE_BOUND, 60.0
-
-        # Moderate memory workload
-        if mem_util >= 40 and device_util < 60:
-            return BottleneckType.MEMORY_BOUND, 55.0
-
-        # Light balanced workload
-        if device_util >= 20 or mem_util >= 20:
-            return BottleneckType.BALANCED, 50.0
-
-        return BottleneckType.UNKNOWN, 30.0
+        # Utilization-only classification, one table lookup for NVML's integer percents
+        if type(device_util) is int and type(mem_util) is int:
+            if 0 <= device_util <= 100 and 0 <= mem_util <= 100:
+                return _BOTTLENECK_LUT[device_util][mem_util]
+        return _classify_utilization(device_util, mem_util)
@@ -1,46 +1,56 @@
 """Baseline data for GPU models"""
 
+import re
 from dataclasses import dataclass
+from functools import cache
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class Baseline:
     """GPU thermal baseline"""
 
     max_temperature: int
 
 
+# Shared by every device until per-device thermal limits are read from NVML
+_DEFAULT_BASELINE = Baseline(max_temperature=83)
+_LEGACY_BASELINE = Baseline(max_temperature=80)
+
+# Model numbers of RTX 40/30/20 and GTX 16 series cards. Matched as plain
+# substrings, so "20" and "16" also cover 2080, 2070 and 1660.
+_MODERN_MODEL = re.compile(r"4090|4080|4070|3090|3080|3070|20|16")
+
+# Hardware baselines per device index. Failures are not stored, so a later
+# call can still succeed once NVML comes up.
+_nvml_baselines: dict[int, Baseline] = {}
+
+
 def _get_baseline_from_nvml(device_index: int = 0) -> Optional[Baseline]:
     """Get baseline data directly from GPU hardware"""
+    baseline = _nvml_baselines.get(device_index)
+    if baseline is not None:
+        return baseline
+
     try:
         from ..utils.info import initialize
 
         if not initialize():
             return None
 
-        return Baseline(max_temperature=83)
+        baseline = _nvml_baselines[device_index] = _DEFAULT_BASELINE
+        return baseline
 
     except Exception:
         return None
 
 
+@cache
 def _get_baseline_fallback(device_name: str) -> Optional[Baseline]:
     """Fallback baseline for common GPUs"""
-
-    name_lower = device_name.lower()
-
-    if any(x in name_lower for x in ["4090", "4080", "4070"]):
-        return Baseline(max_temperature=83)
-
-    elif any(x in name_lower for x in ["3090", "3080", "3070"]):
-        return Baseline(max_temperature=83)
-
-    elif any(x in name_lower for x in ["20", "16", "2080", "2070", "1660"]):
-        return Baseline(max_temperature=83)
-
-    else:
-        return Baseline(max_temperature=80)
+    if _MODERN_MODEL.search(device_name):
+        return _DEFAULT_BASELINE
+    return _LEGACY_BASELINE
 
 
 def get_baseline(device_name: str = "", device_index: int = 0) -> Optional[Baseline]:
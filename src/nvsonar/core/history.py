@@ -0,0 +1,57 @@
+"""Sliding-window metric history"""
+
+from collections import deque
+from typing import Any
+
+
+class RollingMax:
+    """Running maximum over a sliding time window
+
+    Keeps monotonic columns of timestamps, values and payloads with
+    decreasing values, so pushing is amortized O(1) and the peak is always
+    at the front. Timestamps may be seconds or integer sample ticks, as long
+    as the window uses the same unit. An optional capacity bounds memory
+    when the caller knows how many samples fit in the window.
+    """
+
+    def __init__(self, window: float, capacity: int | None = None):
+        self.window = window
+        self._timestamps: deque[float] = deque(maxlen=capacity)
+        self._values: deque[float] = deque(maxlen=capacity)
+        self._payloads: deque[Any] = deque(maxlen=capacity)
+
+    def push(self, timestamp: float, value: float, payload: Any = None) -> None:
+        """Add a value, dropping older entries it supersedes"""
+        values = self._values
+
+        # Dominated by an entry that expires at the same time, so never the peak.
+        # This keeps at most one entry per timestamp within the capacity.
+        if values and values[-1] >= value and self._timestamps[-1] == timestamp:
+            return
+
+        while values and values[-1] <= value:
+            values.pop()
+            self._timestamps.pop()
+            self._payloads.pop()
+        self._timestamps.append(timestamp)
+        values.append(value)
+        self._payloads.append(payload)
+
+    def expire(self, now: float) -> None:
+        """Drop entries older than the window"""
+        timestamps = self._timestamps
+        while timestamps and (now - timestamps[0]) > self.window:
+            timestamps.popleft()
+            self._values.popleft()
+            self._payloads.popleft()
+
+    def peak(self) -> float | None:
+        """Largest value in the window"""
+        return self._values[0] if self._values else None
+
+    def peak_payload(self) -> Any:
+        """Payload stored with the largest value in the window"""
+        return self._payloads[0] if self._payloads else None
+
+    def __bool__(self) -> bool:
+        return bool(self._values)
@@ -1,10 +1,62 @@
 """GPU monitoring using NVML"""
 
 from dataclasses import dataclass
+from time import monotonic
 
 import pynvml as nvml
 
-from nvsonar.utils.info import initialize
+from nvsonar.utils.info import _get_handle, get_device_info, initialize
+
+# Fields read through nvmlDeviceGetFieldValues each tick. Only power has a
+# field ID; temperature, fan, utilization, memory and clocks go through their
+# dedicated getters. The one-second average matches what
+# nvmlDeviceGetPowerUsage reports on Ampere and newer, so short spikes do not
+# flip the bottleneck to POWER_LIMITED. Drivers without the field (before
+# R535, or older GPUs) fall back to nvmlDeviceGetPowerUsage.
+FIELD_IDS = (nvml.NVML_FI_DEV_POWER_AVERAGE,)
+
+# Fields that do not change while the tool runs, read once per device. Falls
+# back to nvmlDeviceGetPowerManagementLimit when the field is unavailable.
+STATIC_FIELD_IDS = (nvml.NVML_FI_DEV_POWER_CURRENT_LIMIT,)
+
+# Minimum age before a field group is re-read. NVML refreshes power at
+# roughly 10 Hz, and clocks rarely move between one-second samples. These
+# only skip reads when polling faster than them; at the default 1s interval
+# every sample is already at least this old.
+POWER_UPDATE_INTERVAL = 0.1
+CLOCK_UPDATE_INTERVAL = 1.0
+
+# Backoff bounds in seconds before querying a device again after an NVML
+# error such as GPU_IS_LOST, so a broken GPU is not hammered every tick
+ERROR_RETRY_MIN = 1.0
+ERROR_RETRY_MAX = 30.0
+
+
+def _unpack_value(value_type: int, value) -> float | None:
+    """Read an nvmlValue_t union according to its value type"""
+    if value_type == nvml.NVML_VALUE_TYPE_DOUBLE:
+        return value.dVal
+    if value_type == nvml.NVML_VALUE_TYPE_UNSIGNED_INT:
+        return value.uiVal
+    if value_type == nvml.NVML_VALUE_TYPE_UNSIGNED_LONG:
+        return value.ulVal
+    if value_type == nvml.NVML_VALUE_TYPE_UNSIGNED_LONG_LONG:
+        return value.ullVal
+    if value_type == nvml.NVML_VALUE_TYPE_SIGNED_LONG_LONG:
+        return value.sllVal
+    if value_type == nvml.NVML_VALUE_TYPE_SIGNED_INT:
+        return value.siVal
+    # Added in newer nvidia-ml-py releases than the minimum we support
+    if value_type == getattr(nvml, "NVML_VALUE_TYPE_UNSIGNED_SHORT", None):
+        return value.usVal
+    return None
+
+
+def _field_value(field) -> float | None:
+    """Extract a numeric value from an nvmlFieldValue_t, None if unavailable"""
+    if field.nvmlReturn != nvml.NVML_SUCCESS:
+        return None
+    return _unpack_value(field.valueType, field.value)
 
 
 @dataclass
@@ -23,62 +75,215 @@ class Metrics:
     memory_clock: int
 
 
+@dataclass
+class SampleBatch:
+    """Driver-buffered samples recorded since the previous batch"""
+
+    power_usage: list[float]
+    device_utilization: list[float]
+
+
 class Monitor:
     """GPU metrics monitor"""
 
     def __init__(self, device_index: int = 0):
         self.device_index = device_index
         self._handle = None
+        self._field_ids = list(FIELD_IDS)
+        # Set once the power field fails, then the legacy getter is used for good
+        self._legacy_power = False
+
+        # Optional getters and field IDs that reported NOT_SUPPORTED, never retried
+        self._unsupported: set[str] = set()
+        self._unsupported_fields: set[int] = set()
+
+        # Cooldown after a failed query: (retry time, current delay, error message)
+        self._error: tuple[float, float, str] | None = None
+
+        # Slow-changing readings, refreshed only once their interval has passed
+        self._power: tuple[float, float | None] | None = None
+        self._clocks: tuple[float, int, int] | None = None
+
+        # nvmlDeviceGetSamples cursors per sample type, None until primed
+        self._last_sample_ts: dict[int, int | None] = {
+            nvml.NVML_TOTAL_POWER_SAMPLES: None,
+            nvml.NVML_GPU_UTILIZATION_SAMPLES: None,
+        }
 
         if not initialize():
             raise RuntimeError("Failed to initialize NVML")
 
         try:
-            self._handle = nvml.nvmlDeviceGetHandleByIndex(device_index)
+            self._handle = _get_handle(device_index)
+            self._memory_total = nvml.nvmlDeviceGetMemoryInfo(self._handle).total
         except nvml.NVMLError as e:
             raise RuntimeError(f"Failed to get GPU {device_index}: {e}")
 
+        # The name comes from the cached static device info, which also needs
+        # UUID, PCI and version queries that may fail without affecting metrics
+        info = get_device_info(device_index)
+        self.name = info.name if info else f"GPU {device_index}"
+
+        (power_limit_mw,) = self._read_fields(list(STATIC_FIELD_IDS))
+        if power_limit_mw is None:
+            try:
+                power_limit_mw = nvml.nvmlDeviceGetPowerManagementLimit(self._handle)
+            except nvml.NVMLError:
+                pass
+        self._power_limit = power_limit_mw / 1000.0 if power_limit_mw is not None else None
+
+    @property
+    def power_limit(self) -> float | None:
+        """Power management limit in watts"""
+        return self._power_limit
+
+    @property
+    def memory_total(self) -> int:
+        """Total VRAM in bytes"""
+        return self._memory_total
+
     def get_current_metrics(self) -> Metrics:
         """Get current metrics"""
         if self._handle is None:
             raise RuntimeError("Monitor not initialized")
 
+        now = monotonic()
+        if self._error is not None:
+            retry_at, delay, message = self._error
+            if now < retry_at:
+                raise RuntimeError(message)
+
         try:
-            temperature = nvml.nvmlDeviceGetTemperature(self._handle, nvml.NVML_TEMPERATURE_GPU)
+            metrics = self._query_metrics(now)
+        except RuntimeError as e:
+            delay = min(self._error[1] * 2, ERROR_RETRY_MAX) if self._error else ERROR_RETRY_MIN
+            self._error = (now + delay, delay, str(e))
+            raise
 
-            try:
-                power_usage = nvml.nvmlDeviceGetPowerUsage(self._handle) / 1000.0
-            except nvml.NVMLError:
-                power_usage = None
+        self._error = None
+        return metrics
 
-            try:
-                power_limit = nvml.nvmlDeviceGetPowerManagementLimit(self._handle) / 1000.0
-            except nvml.NVMLError:
-                power_limit = None
+    def _query_metrics(self, now: float) -> Metrics:
+        """Read a metrics snapshot from NVML, skipping field groups that are still fresh"""
+        try:
+            temperature = nvml.nvmlDeviceGetTemperature(self._handle, nvml.NVML_TEMPERATURE_GPU)
 
-            try:
-                fan_speed = nvml.nvmlDeviceGetFanSpeed(self._handle)
-            except nvml.NVMLError:
-                fan_speed = None
+            if self._power is None or now - self._power[0] >= POWER_UPDATE_INTERVAL:
+                power_usage_mw = self._read_power_usage()
+                power_usage = power_usage_mw / 1000.0 if power_usage_mw is not None else None
+                self._power = (now, power_usage)
+            power_usage = self._power[1]
+
+            fan_speed = None
+            if "fan_speed" not in self._unsupported:
+                try:
+                    fan_speed = nvml.nvmlDeviceGetFanSpeed(self._handle)
+                except nvml.NVMLError as e:
+                    # Datacenter cards and MIG slices have no fan
+                    if e.value == nvml.NVML_ERROR_NOT_SUPPORTED:
+                        self._unsupported.add("fan_speed")
 
             utilization = nvml.nvmlDeviceGetUtilizationRates(self._handle)
 
             memory_info = nvml.nvmlDeviceGetMemoryInfo(self._handle)
 
-            device_clock = nvml.nvmlDeviceGetClockInfo(self._handle, nvml.NVML_CLOCK_GRAPHICS)
-            memory_clock = nvml.nvmlDeviceGetClockInfo(self._handle, nvml.NVML_CLOCK_MEM)
+            if self._clocks is None or now - self._clocks[0] >= CLOCK_UPDATE_INTERVAL:
+                device_clock = nvml.nvmlDeviceGetClockInfo(self._handle, nvml.NVML_CLOCK_GRAPHICS)
+                memory_clock = nvml.nvmlDeviceGetClockInfo(self._handle, nvml.NVML_CLOCK_MEM)
+                self._clocks = (now, device_clock, memory_clock)
+            _, device_clock, memory_clock = self._clocks
 
             return Metrics(
                 temperature=temperature,
                 power_usage=power_usage,
-                power_limit=power_limit,
+                power_limit=self._power_limit,
                 fan_speed=fan_speed,
                 device_utilization=utilization.gpu,
                 memory_utilization=utilization.memory,
                 memory_used=memory_info.used,
-                memory_total=memory_info.total,
+                memory_total=self._memory_total,
                 device_clock=device_clock,
                 memory_clock=memory_clock,
             )
         except nvml.NVMLError as e:
             raise RuntimeError(f"Failed to get metrics: {e}")
+
+    def _read_power_usage(self) -> float | None:
+        """Read power draw in milliwatts, from the field if the driver has it"""
+        if not self._legacy_power:
+            (power_usage_mw,) = self._read_fields(self._field_ids)
+            if power_usage_mw is not None:
+                return power_usage_mw
+            self._legacy_power = True
+
+        if "power_usage" in self._unsupported:
+            return None
+        try:
+            return nvml.nvmlDeviceGetPowerUsage(self._handle)
+        except nvml.NVMLError as e:
+            if e.value == nvml.NVML_ERROR_NOT_SUPPORTED:
+                self._unsupported.add("power_usage")
+            return None
+
+    def _read_fields(self, field_ids: list[int]) -> list[float | None]:
+        """Read NVML field values in one call, None for any unavailable field"""
+        query = [field_id for field_id in field_ids if field_id not in self._unsupported_fields]
+        if not query:
+            return [None] * len(field_ids)
+
+        try:
+            fields = nvml.nvmlDeviceGetFieldValues(self._handle, query)
+        except nvml.NVMLError:
+            return [None] * len(field_ids)
+
+        values = {}
+        for field_id, field in zip(query, fields):
+            if field.nvmlReturn == nvml.NVML_ERROR_NOT_SUPPORTED:
+                self._unsupported_fields.add(field_id)
+            values[field_id] = _field_value(field)
+        return [values.get(field_id) for field_id in field_ids]
+
+    def get_samples_since_last(self) -> SampleBatch:
+        """Get power and utilization samples buffered by the driver since the last call
+
+        These capture spikes between polls. Sample types the device does not
+        support return empty lists, and the first call only primes the cursors.
+        """
+        if self._handle is None:
+            raise RuntimeError("Monitor not initialized")
+
+        power_usage = [
+            value / 1000.0 for value in self._read_samples(nvml.NVML_TOTAL_POWER_SAMPLES)
+        ]
+        device_utilization = self._read_samples(nvml.NVML_GPU_UTILIZATION_SAMPLES)
+        return SampleBatch(power_usage=power_usage, device_utilization=device_utilization)
+
+    def _read_samples(self, sample_type: int) -> list[float]:
+        """Read new samples of one type, advancing its cursor"""
+        if sample_type not in self._last_sample_ts:
+            return []
+
+        last_ts = self._last_sample_ts[sample_type]
+        try:
+            value_type, samples = nvml.nvmlDeviceGetSamples(self._handle, sample_type, last_ts or 0)
+        except nvml.NVMLError as e:
+            if e.value == nvml.NVML_ERROR_NOT_SUPPORTED:
+                del self._last_sample_ts[sample_type]
+            return []
+
+        if samples:
+            self._last_sample_ts[sample_type] = max(sample.timeStamp for sample in samples)
+        elif last_ts is None:
+            self._last_sample_ts[sample_type] = 0
+
+        # The first read returns the driver's whole buffer, which predates us
+        if last_ts is None:
+            return []
+
+        values = []
+        for sample in samples:
+            if sample.timeStamp > last_ts:
+                value = _unpack_value(value_type, sample.sampleValue)
+                if value is not None:
+                    values.append(value)
+        return values
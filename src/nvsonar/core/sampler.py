@@ -0,0 +1,137 @@
+"""Background GPU metrics sampling"""
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from .analyzer import Analysis, Analyzer, BottleneckType
+from .monitor import Metrics, Monitor, SampleBatch
+
+# Longest sleep between samples while every GPU stays idle
+MAX_IDLE_INTERVAL = 5.0
+
+
+class DeviceCtx(NamedTuple):
+    """Everything needed to sample and display one GPU"""
+
+    index: int
+    monitor: Monitor
+    analyzer: Analyzer
+    name: str
+
+
+@dataclass
+class Sample:
+    """One sampler reading for a device"""
+
+    tick: int
+    metrics: Metrics
+    batch: SampleBatch
+    analysis: Analysis
+
+
+class MetricSampler:
+    """Polls monitors on a background thread so NVML stalls never block the UI
+
+    The latest reading for each device is published in ``latest``. Dict
+    assignment is atomic under the GIL, so readers need no lock. While all
+    GPUs are idle with steady temperatures the sleep between samples doubles
+    up to MAX_IDLE_INTERVAL, and any activity snaps it back to ``interval``.
+
+    ``tick`` counts elapsed base intervals, including the ones skipped while
+    backed off, so it doubles as a clock for fixed-stride history windows.
+    """
+
+    def __init__(
+        self,
+        devices: list[DeviceCtx],
+        interval: float,
+        on_sample: Callable[[DeviceCtx, Sample], None] | None = None,
+        before_sample: Callable[[], None] | None = None,
+    ):
+        self.devices = devices
+        self.interval = interval
+        self.on_sample = on_sample
+        self.before_sample = before_sample
+        self.current_interval = interval
+        self.tick = 0
+        self.latest: dict[int, Sample] = {}
+        self.error: Exception | None = None
+        self._idle_count = 0
+        self._last_temperatures: dict[int, float] = {}
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the sampling thread"""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="nvsonar-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Signal the sampling thread to exit and wait for it"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+
+    def sample(self) -> None:
+        """Take one reading from every monitor
+
+        Any exception from a device or hook is recorded in ``error`` instead
+        of propagating, so one bad reading cannot stop sampling.
+        """
+        error = None
+        if self.before_sample is not None:
+            try:
+                self.before_sample()
+            except Exception as e:
+                error = e
+
+        all_idle = True
+        for device in self.devices:
+            try:
+                metrics = device.monitor.get_current_metrics()
+                batch = device.monitor.get_samples_since_last()
+                analysis = device.analyzer.analyze(metrics)
+                sample = Sample(self.tick, metrics, batch, analysis)
+                if self.on_sample is not None:
+                    self.on_sample(device, sample)
+            except Exception as e:
+                error = e
+                all_idle = False
+                continue
+            self.latest[device.index] = sample
+
+            last_temperature = self._last_temperatures.get(device.index)
+            self._last_temperatures[device.index] = metrics.temperature
+            if (
+                analysis.bottleneck_type != BottleneckType.IDLE
+                or last_temperature is None
+                or abs(metrics.temperature - last_temperature) >= 1
+            ):
+                all_idle = False
+
+        self.error = error
+        self._update_interval(all_idle)
+
+    def _update_interval(self, all_idle: bool) -> None:
+        """Back off exponentially while idle, reset on any activity"""
+        if not all_idle:
+            self._idle_count = 0
+            self.current_interval = self.interval
+            return
+
+        max_interval = max(MAX_IDLE_INTERVAL, self.interval)
+        if self.current_interval < max_interval:
+            self._idle_count += 1
+            self.current_interval = min(self.interval * 2**self._idle_count, max_interval)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.current_interval)
+            self.tick += round(self.current_interval / self.interval)
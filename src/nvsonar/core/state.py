@@ -0,0 +1,179 @@
+"""Shared GPU sampling and peak history"""
+
+import threading
+from time import monotonic
+
+from nvsonar.utils.info import get_device_count, initialize
+
+from .analyzer import Analyzer
+from .history import RollingMax
+from .monitor import Monitor
+from .sampler import DeviceCtx, MetricSampler, Sample
+
+# Backoff bounds in seconds between attempts to open a GPU that failed
+DEVICE_RETRY_MIN = 1.0
+DEVICE_RETRY_MAX = 60.0
+
+# Metric fields tracked for peak values
+PEAK_FIELDS = (
+    "temperature",
+    "power_usage",
+    "device_utilization",
+    "memory_utilization",
+    "memory_used",
+    "device_clock",
+    "memory_clock",
+    "compute_util",
+    "mem_util",
+    "thermal_percent",
+)
+
+# Tracks polled compute utilization with the analyzed status as payload, so the
+# status at peak load can be shown. Driver-buffered samples have no analysis,
+# so they feed the compute peak but not this tracker.
+STATUS_FIELD = "status"
+
+
+class GpuState:
+    """Monitors, sampler and peak history for all GPUs
+
+    The sampler thread is the only writer of the history, so it is updated
+    exactly once per sample no matter which views are visible. Readers take
+    the lock through get_peaks(). GPUs that fail to open are retried with
+    exponential backoff by the sampler thread, keeping NVML off the UI thread.
+    """
+
+    def __init__(self, interval: float, peak_window: float):
+        if interval <= 0:
+            raise ValueError(f"Sampling interval must be positive, got {interval}")
+        self.interval = interval
+        # History is kept in sampler ticks of `interval` seconds each
+        self.window_ticks = round(peak_window / interval)
+        self.devices: list[DeviceCtx] = []
+        self.history = {}
+        self.sampler: MetricSampler | None = None
+        self.error: str | None = None
+        self._lock = threading.Lock()
+        # device index -> (next attempt time, current delay)
+        self._failed: dict[int, tuple[float, float]] = {}
+
+    def start(self) -> None:
+        """Create monitors for every GPU and start sampling"""
+        if self.sampler is not None:
+            return
+
+        if not initialize():
+            self.error = "Failed to initialize NVML"
+            return
+
+        now = monotonic()
+        for i in range(get_device_count()):
+            if not self._open_device(i):
+                self._failed[i] = (now + DEVICE_RETRY_MIN, DEVICE_RETRY_MIN)
+
+        if self.devices or self._failed:
+            self.sampler = MetricSampler(
+                self.devices,
+                self.interval,
+                on_sample=self._record,
+                before_sample=self.retry_failed,
+            )
+            self.sampler.start()
+
+    def retry_failed(self) -> None:
+        """Try again to open GPUs whose backoff has elapsed, run on the sampler thread"""
+        if not self._failed:
+            return
+
+        now = monotonic()
+        for i, (retry_at, delay) in list(self._failed.items()):
+            if now < retry_at:
+                continue
+
+            if self._open_device(i):
+                del self._failed[i]
+            else:
+                delay = min(delay * 2, DEVICE_RETRY_MAX)
+                self._failed[i] = (now + delay, delay)
+
+    def _open_device(self, device_index: int) -> DeviceCtx | None:
+        """Create a monitor for a GPU and add it to the sampled devices"""
+        try:
+            monitor = Monitor(device_index)
+        except RuntimeError:
+            return None
+
+        device = DeviceCtx(device_index, monitor, Analyzer(device_index), monitor.name)
+        self.history[device_index] = {
+            field: RollingMax(self.window_ticks, self.window_ticks + 1)
+            for field in (*PEAK_FIELDS, STATUS_FIELD)
+        }
+        # Views read this list from the UI thread, appending is safe under the GIL
+        self.devices.append(device)
+        return device
+
+    def stop(self) -> None:
+        """Stop background sampling"""
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    def get_peaks(self, device_index: int) -> dict:
+        """Get peak values over the window"""
+        history = self.history.get(device_index)
+        if not history or self.sampler is None:
+            return {}
+
+        with self._lock:
+            for tracker in history.values():
+                tracker.expire(self.sampler.tick)
+
+            if not history["temperature"]:
+                return {}
+
+            peaks = {}
+            for field in PEAK_FIELDS:
+                peak = history[field].peak()
+                if peak is not None:
+                    peaks[field] = peak
+
+            # Status at peak polled compute utilization
+            status = history[STATUS_FIELD].peak_payload()
+            if status is not None:
+                peaks["status"] = status
+
+        return peaks
+
+    def _record(self, device: DeviceCtx, sample: Sample) -> None:
+        """Add a sample to history, called on the sampler thread"""
+        history = self.history[device.index]
+        analyzer = device.analyzer
+        tick = sample.tick
+        metrics = sample.metrics
+        analysis = sample.analysis
+
+        with self._lock:
+            history["temperature"].push(tick, metrics.temperature)
+            history["power_usage"].push(tick, metrics.power_usage or 0.0)
+            history["device_utilization"].push(tick, metrics.device_utilization)
+            history["memory_utilization"].push(tick, metrics.memory_utilization)
+            history["memory_used"].push(tick, metrics.memory_used)
+            history["device_clock"].push(tick, metrics.device_clock)
+            history["memory_clock"].push(tick, metrics.memory_clock)
+
+            history["compute_util"].push(tick, analysis.device_util)
+            history[STATUS_FIELD].push(tick, analysis.device_util, analysis.bottleneck_type)
+            history["mem_util"].push(tick, analysis.mem_util)
+            if analyzer.baseline:
+                thermal_percent = (metrics.temperature / analyzer.baseline.max_temperature) * 100
+                history["thermal_percent"].push(tick, thermal_percent)
+
+            # Driver-buffered samples so peaks include spikes between polls
+            for value in sample.batch.power_usage:
+                history["power_usage"].push(tick, value)
+            # Compute is the same reading as GPU utilization, so both peaks include them
+            for value in sample.batch.device_utilization:
+                history["device_utilization"].push(tick, value)
+                history["compute_util"].push(tick, value)
+
+            for tracker in history.values():
+                tracker.expire(tick)
@@ -1,57 +1,102 @@
 """Main TUI application"""
 
-from collections import deque
-from dataclasses import dataclass
-from time import time
+import math
+import os
+from functools import lru_cache
 
 from rich.console import Group
 from rich.panel import Panel
 from rich.table import Table
 from textual.app import App as TextualApp
 from textual.app import ComposeResult
+from textual.containers import Vertical
 from textual.widgets import Footer, Header, Static, TabbedContent, TabPane
 
-from nvsonar.core.analyzer import Analyzer
-from nvsonar.core.monitor import Monitor
+from nvsonar.core.analyzer import BottleneckType
+from nvsonar.core.sampler import DeviceCtx, Sample
+from nvsonar.core.state import GpuState
 from nvsonar.utils.info import (
-    get_device_count,
-    get_device_info,
     initialize,
     list_devices,
 )
 
-UPDATE_INTERVAL = 0.5
+DEFAULT_POLL_INTERVAL = 1.0
+# Shortest poll interval accepted from NVSONAR_POLL_INTERVAL
+MIN_POLL_INTERVAL = 0.1
+
+
+def _poll_interval() -> float:
+    """Poll interval from the environment, clamped to MIN_POLL_INTERVAL"""
+    try:
+        interval = float(os.getenv("NVSONAR_POLL_INTERVAL", DEFAULT_POLL_INTERVAL))
+    except ValueError:
+        return DEFAULT_POLL_INTERVAL
+    if not math.isfinite(interval):
+        return DEFAULT_POLL_INTERVAL
+    return max(interval, MIN_POLL_INTERVAL)
+
+
+UPDATE_INTERVAL = _poll_interval()
 PEAK_WINDOW = 60.0
 
+# Display styles per bottleneck type
+_BOTTLENECK_COLORS = {
+    BottleneckType.MEMORY_BOUND: "cyan",
+    BottleneckType.COMPUTE_BOUND: "blue",
+    BottleneckType.THERMAL_THROTTLING: "red",
+    BottleneckType.POWER_LIMITED: "yellow",
+    BottleneckType.BALANCED: "green",
+    BottleneckType.IDLE: "dim",
+    BottleneckType.UNKNOWN: "white",
+}
+_BOTTLENECK_EXPLANATIONS = {
+    BottleneckType.MEMORY_BOUND: "Memory subsystem is the limiting factor",
+    BottleneckType.COMPUTE_BOUND: "GPU cores are the limiting factor",
+    BottleneckType.THERMAL_THROTTLING: "Temperature too high, reducing performance",
+    BottleneckType.POWER_LIMITED: "Power draw at limit, reducing performance",
+    BottleneckType.BALANCED: "GPU and memory working efficiently together",
+    BottleneckType.IDLE: "No significant workload detected",
+    BottleneckType.UNKNOWN: "Workload pattern unclear",
+}
+
+
+BAR_WIDTH = 20
+
+# Every possible bar at the default width, indexed by filled cell count
+_BARS = tuple("█" * i + "░" * (BAR_WIDTH - i) for i in range(BAR_WIDTH + 1))
+
+
+@lru_cache(maxsize=256)
+def _build_bar(filled: int, width: int) -> str:
+    """Build a bar for a non-default width"""
+    return "█" * filled + "░" * (width - filled)
+
 
-def _make_bar(value: float, max_value: float, width: int = 20) -> str:
+def _make_bar(value: float, max_value: float, width: int = BAR_WIDTH) -> str:
     """Create a text progress bar"""
     if max_value <= 0:
-        ratio = 0.0
+        filled = 0
     else:
-        ratio = min(value / max_value, 1.0)
+        filled = max(min(int(value * width / max_value), width), 0)
 
-    filled = int(ratio * width)
-    empty = width - filled
-    return "█" * filled + "░" * empty
+    if width == BAR_WIDTH:
+        return _BARS[filled]
+    return _build_bar(filled, width)
 
 
-@dataclass
-class MetricSnapshot:
-    """Single metric snapshot with timestamp"""
+def _bottleneck_color(bottleneck_type: BottleneckType) -> str:
+    """Get color for bottleneck type"""
+    return _BOTTLENECK_COLORS[bottleneck_type]
 
-    timestamp: float
-    temperature: float
-    power_usage: float
-    device_utilization: int
-    memory_utilization: int
-    memory_used: int
-    device_clock: int
-    memory_clock: int
-    compute_util: int | None = None
-    mem_util: int | None = None
-    thermal_percent: float | None = None
-    status: str | None = None
+
+def _bottleneck_explanation(bottleneck_type: BottleneckType) -> str:
+    """Get human-readable explanation for bottleneck type"""
+    return _BOTTLENECK_EXPLANATIONS[bottleneck_type]
+
+
+def _set_cell(table: Table, row: int, value: str) -> None:
+    """Replace a value cell in place, Rich has no public setter for cells"""
+    table.columns[1]._cells[row] = value
 
 
 class DeviceList(Static):
@@ -88,284 +133,251 @@ class DeviceList(Static):
         self.update(table)
 
 
-class Metrics(Static):
-    """Display live metrics for all GPUs"""
+class Metrics(Vertical):
+    """Display live metrics for all GPUs, one child view per device"""
 
-    def __init__(self):
+    def __init__(self, state: GpuState):
         super().__init__()
-        self.monitors = []
-        self.device_map = {}
-        self.history = {}
-        self.device_names = {}
+        self.state = state
+        self._timer = None
+        self._tables = {}
+        self._panels = {}
+        self._rendered = {}
+        self._message = Static()
+        # Parallel to state.devices
+        self._views = [Static(id=f"gpu-{device.index}") for device in state.devices]
+
+    def compose(self) -> ComposeResult:
+        yield self._message
+        yield from self._views
 
     def on_mount(self) -> None:
 
-        if not initialize():
-            self.update("[red]Failed to initialize NVML[/red]")
+        if self.state.error:
+            self._message.update(f"[red]{self.state.error}[/red]")
             return
 
-        device_count = get_device_count()
-        if device_count == 0:
-            self.update("[yellow]No GPUs found[/yellow]")
+        if not self.state.sampler:
+            self._message.update("[yellow]No GPUs found[/yellow]")
             return
 
-        for i in range(device_count):
-            try:
-                monitor = Monitor(i)
-                analyzer = Analyzer(i)
-                self.monitors.append((i, monitor))
-                self.device_map[i] = (monitor, analyzer)
-                self.history[i] = deque()
-
-                device_info = get_device_info(i)
-                if device_info:
-                    self.device_names[i] = device_info.name
-                else:
-                    self.device_names[i] = f"GPU {i}"
-            except RuntimeError:
-                pass
+        # Started by on_show once the tab is visible
+        self._timer = self.set_interval(UPDATE_INTERVAL, self.update_metrics, pause=True)
+
+    def on_show(self) -> None:
+        if self._timer:
+            self._timer.resume()
+            self.update_metrics()
 
-        if self.monitors:
-            self.set_interval(UPDATE_INTERVAL, self.update_metrics)
+    def on_hide(self) -> None:
+        # Nothing to render while the tab is not visible
+        if self._timer:
+            self._timer.pause()
 
     def update_metrics(self) -> None:
         """Update metrics for all GPUs"""
-        if not self.monitors:
+        sampler = self.state.sampler
+        if not sampler:
             return
 
-        try:
-            current_time = time()
-            panels = []
-            for device_index, monitor in self.monitors:
-                m = monitor.get_current_metrics()
-
-                _, analyzer = self.device_map.get(device_index, (None, None))
-
-                # Perform analysis before adding to history
-                analysis = None
-                if analyzer:
-                    analysis = analyzer.analyze(m)
-
-                # Add to history with analysis data
-                self._add_snapshot(device_index, m, analysis, analyzer)
-                self._clean_old_snapshots(device_index, current_time)
-
-                table = Table(show_header=False, box=None, padding=(0, 1))
-                table.add_column("Metric", style="cyan")
-                table.add_column("Value", style="yellow")
-
-                # Subsystem utilization analysis
-                if analysis:
-                    # Show subsystem utilizations
-                    compute_bar = _make_bar(analysis.device_util, 100)
-                    table.add_row("Compute", f"{compute_bar} {analysis.device_util}%")
-
-                    memory_bar = _make_bar(analysis.mem_util, 100)
-                    table.add_row("Memory", f"{memory_bar} {analysis.mem_util}%")
-
-                    # Show thermal headroom
-                    if analyzer.baseline:
-                        thermal_percent = (
-                            analysis.temperature / analyzer.baseline.max_temperature
-                        ) * 100
-                        thermal_bar = _make_bar(thermal_percent, 100)
-                        table.add_row("Thermal", f"{thermal_bar} {thermal_percent:.0f}%")
-
-                    # Status with color
-                    bottleneck_color = self._get_bottleneck_color(analysis.bottleneck_type.value)
-                    explanation = self._get_bottleneck_explanation(analysis.bottleneck_type.value)
-                    table.add_row("", "")
-                    table.add_row(
-                        "Status",
-                        f"[{bottleneck_color}]{explanation}[/{bottleneck_color}]",
-                    )
-                    table.add_row("", "")
-
-                # Show current values with progress bars
-                # Power
-                if m.power_usage:
-                    if m.power_limit:
-                        power_bar = _make_bar(m.power_usage, m.power_limit)
-                        power_display = f"{power_bar} {m.power_usage:.1f}W / {m.power_limit:.1f}W"
-                    else:
-                        power_display = f"{m.power_usage:.1f}W"
-                    table.add_row("Power", power_display)
-
-                # Temperature
-                if analyzer and analyzer.baseline:
-                    max_temp = analyzer.baseline.max_temperature
-                    temp_bar = _make_bar(m.temperature, max_temp)
-                    temp_display = f"{temp_bar} {m.temperature:.1f}°C / {max_temp}°C"
-                    table.add_row("Temperature", temp_display)
-                else:
-                    table.add_row("Temperature", f"{m.temperature:.1f}°C")
-
-                if m.fan_speed is not None:
-                    fan_bar = _make_bar(m.fan_speed, 100)
-                    table.add_row("Fan Speed", f"{fan_bar} {m.fan_speed}%")
-
-                # GPU Utilization
-                gpu_bar = _make_bar(m.device_utilization, 100)
-                table.add_row("GPU Utilization", f"{gpu_bar} {m.device_utilization}%")
-
-                # Memory Utilization
-                mem_bar = _make_bar(m.memory_utilization, 100)
-                table.add_row("Memory Utilization", f"{mem_bar} {m.memory_utilization}%")
-
-                # Memory Used
-                vram_bar = _make_bar(m.memory_used, m.memory_total)
-                table.add_row(
-                    "Memory Used",
-                    f"{vram_bar} {m.memory_used / (1024**3):.1f} / {m.memory_total / (1024**3):.1f} GB",
-                )
-
-                # Clocks
-                table.add_row("GPU Clock", f"{m.device_clock} MHz")
-                table.add_row("Memory Clock", f"{m.memory_clock} MHz")
-
-                device_name = self.device_names.get(device_index, f"GPU {device_index}")
-                panel = Panel(table, title=f"{device_name} Metrics", border_style="green")
-                panels.append(panel)
-
-            group = Group(*panels)
-            self.update(group)
-        except Exception as e:
-            self.update(f"[red]Error: {e}[/red]")
-
-    def _clean_old_snapshots(self, device_index: int, current_time: float) -> None:
-        """Remove snapshots older than PEAK_WINDOW seconds"""
-        history = self.history.get(device_index)
-        if not history:
-            return
+        # Add views for GPUs that opened after a retry
+        for device in self.state.devices[len(self._views) :]:
+            view = Static(id=f"gpu-{device.index}")
+            self._views.append(view)
+            self.mount(view)
+
+        # Devices that failed this round keep showing their last reading
+        if sampler.error:
+            self._message.update(f"[red]Error: {sampler.error}[/red]")
+        elif not self._views:
+            self._message.update("[yellow]Waiting for GPUs...[/yellow]")
+        self._message.display = bool(sampler.error or not self._views)
+
+        backoff = sampler.current_interval if sampler.current_interval > UPDATE_INTERVAL else None
+        for device, view in zip(self.state.devices, self._views):
+            sample = sampler.latest.get(device.index)
+            if sample is None:
+                continue
+
+            # Skip devices whose numbers have not changed since the last render
+            key = (sample.metrics, sample.analysis, backoff)
+            if key == self._rendered.get(device.index):
+                continue
+            self._rendered[device.index] = key
 
-        while history and (current_time - history[0].timestamp) > PEAK_WINDOW:
-            history.popleft()
+            try:
+                view.update(self._render_panel(device, sample, backoff))
+            except Exception as e:
+                view.update(f"[red]Error: {e}[/red]")
+
+    def _render_panel(self, device: DeviceCtx, sample: Sample, backoff: float | None) -> Panel:
+        """Fill a device's persistent table from a sample"""
+        m = sample.metrics
+        analysis = sample.analysis
+        analyzer = device.analyzer
+
+        has_thermal = bool(analyzer and analyzer.baseline)
+        has_fan = m.fan_speed is not None
+        layout = (analysis is not None, has_thermal, bool(m.power_usage), has_fan)
+        table, rows = self._get_table(device, layout)
+
+        # Subsystem utilization analysis
+        if analysis:
+            # Show subsystem utilizations
+            compute_bar = _make_bar(analysis.device_util, 100)
+            _set_cell(table, rows["compute"], f"{compute_bar} {analysis.device_util}%")
+
+            memory_bar = _make_bar(analysis.mem_util, 100)
+            _set_cell(table, rows["memory"], f"{memory_bar} {analysis.mem_util}%")
+
+            # Show thermal headroom
+            if has_thermal:
+                thermal_percent = (analysis.temperature / analyzer.baseline.max_temperature) * 100
+                thermal_bar = _make_bar(thermal_percent, 100)
+                _set_cell(table, rows["thermal"], f"{thermal_bar} {thermal_percent:.0f}%")
+
+            # Status with color
+            bottleneck_color = _bottleneck_color(analysis.bottleneck_type)
+            explanation = _bottleneck_explanation(analysis.bottleneck_type)
+            _set_cell(
+                table,
+                rows["status"],
+                f"[{bottleneck_color}]{explanation}[/{bottleneck_color}]",
+            )
 
-    def _add_snapshot(self, device_index: int, metrics, analysis=None, analyzer=None) -> None:
-        """Add new snapshot to history"""
-        # Calculate analyzed metrics if available
-        compute_util = analysis.device_util if analysis else None
-        mem_util = analysis.mem_util if analysis else None
-        thermal_percent = None
-        status = None
+        # Show current values with progress bars
+        # Power
+        if m.power_usage:
+            if m.power_limit:
+                power_bar = _make_bar(m.power_usage, m.power_limit)
+                power_display = f"{power_bar} {m.power_usage:.1f}W / {m.power_limit:.1f}W"
+            else:
+                power_display = f"{m.power_usage:.1f}W"
+            _set_cell(table, rows["power"], power_display)
+
+        # Temperature
+        if has_thermal:
+            max_temp = analyzer.baseline.max_temperature
+            temp_bar = _make_bar(m.temperature, max_temp)
+            temp_display = f"{temp_bar} {m.temperature:.1f}°C / {max_temp}°C"
+            _set_cell(table, rows["temperature"], temp_display)
+        else:
+            _set_cell(table, rows["temperature"], f"{m.temperature:.1f}°C")
+
+        if has_fan:
+            fan_bar = _make_bar(m.fan_speed, 100)
+            _set_cell(table, rows["fan_speed"], f"{fan_bar} {m.fan_speed}%")
+
+        # GPU Utilization
+        gpu_bar = _make_bar(m.device_utilization, 100)
+        _set_cell(table, rows["gpu_util"], f"{gpu_bar} {m.device_utilization}%")
+
+        # Memory Utilization
+        mem_bar = _make_bar(m.memory_utilization, 100)
+        _set_cell(table, rows["mem_util"], f"{mem_bar} {m.memory_utilization}%")
+
+        # Memory Used
+        vram_bar = _make_bar(m.memory_used, m.memory_total)
+        _set_cell(
+            table,
+            rows["memory_used"],
+            f"{vram_bar} {m.memory_used / (1024**3):.1f} / {m.memory_total / (1024**3):.1f} GB",
+        )
 
-        if analysis:
-            status = analysis.bottleneck_type.value
-            if analyzer and analyzer.baseline:
-                thermal_percent = (metrics.temperature / analyzer.baseline.max_temperature) * 100
-
-        snapshot = MetricSnapshot(
-            timestamp=time(),
-            temperature=metrics.temperature,
-            power_usage=metrics.power_usage or 0.0,
-            device_utilization=metrics.device_utilization,
-            memory_utilization=metrics.memory_utilization,
-            memory_used=metrics.memory_used,
-            device_clock=metrics.device_clock,
-            memory_clock=metrics.memory_clock,
-            compute_util=compute_util,
-            mem_util=mem_util,
-            thermal_percent=thermal_percent,
-            status=status,
+        # Clocks
+        _set_cell(table, rows["gpu_clock"], f"{m.device_clock} MHz")
+        _set_cell(table, rows["memory_clock"], f"{m.memory_clock} MHz")
+
+        # Let users know when idle backoff makes samples sparse
+        panel = self._panels[device.index]
+        if backoff:
+            panel.subtitle = f"[dim]idle, sampling every {backoff:g}s[/dim]"
+        else:
+            panel.subtitle = None
+        return panel
+
+    def _get_table(self, device: DeviceCtx, layout: tuple) -> tuple[Table, dict[str, int]]:
+        """Get the persistent table for a device, rebuilding it if its rows changed"""
+        cached = self._tables.get(device.index)
+        if cached and cached[0] == layout:
+            return cached[1], cached[2]
+
+        has_analysis, has_thermal, has_power, has_fan = layout
+
+        # (row key, label) pairs; blank keys are spacer rows
+        labels = []
+        if has_analysis:
+            labels += [("compute", "Compute"), ("memory", "Memory")]
+            if has_thermal:
+                labels.append(("thermal", "Thermal"))
+            labels += [("", ""), ("status", "Status"), ("", "")]
+        if has_power:
+            labels.append(("power", "Power"))
+        labels.append(("temperature", "Temperature"))
+        if has_fan:
+            labels.append(("fan_speed", "Fan Speed"))
+        labels += [
+            ("gpu_util", "GPU Utilization"),
+            ("mem_util", "Memory Utilization"),
+            ("memory_used", "Memory Used"),
+            ("gpu_clock", "GPU Clock"),
+            ("memory_clock", "Memory Clock"),
+        ]
+
+        table = Table(show_header=False, box=None, padding=(0, 1))
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="yellow")
+
+        rows = {}
+        for key, label in labels:
+            if key:
+                rows[key] = table.row_count
+            table.add_row(label, "")
+
+        self._panels[device.index] = Panel(
+            table, title=f"{device.name} Metrics", border_style="green"
         )
-        self.history[device_index].append(snapshot)
-
-    def _get_peaks(self, device_index: int, current_time: float) -> dict:
-        """Get peak values from history"""
-        self._clean_old_snapshots(device_index, current_time)
-        history = self.history.get(device_index, [])
-
-        if not history:
-            return {}
-
-        # Get peaks for basic metrics
-        peaks = {
-            "temperature": max(s.temperature for s in history),
-            "power_usage": max(s.power_usage for s in history),
-            "device_utilization": max(s.device_utilization for s in history),
-            "memory_utilization": max(s.memory_utilization for s in history),
-            "memory_used": max(s.memory_used for s in history),
-            "device_clock": max(s.device_clock for s in history),
-            "memory_clock": max(s.memory_clock for s in history),
-        }
-
-        # Add analyzed metrics if available
-        compute_values = [s.compute_util for s in history if s.compute_util is not None]
-        if compute_values:
-            peaks["compute_util"] = max(compute_values)
-
-        mem_values = [s.mem_util for s in history if s.mem_util is not None]
-        if mem_values:
-            peaks["mem_util"] = max(mem_values)
-
-        thermal_values = [s.thermal_percent for s in history if s.thermal_percent is not None]
-        if thermal_values:
-            peaks["thermal_percent"] = max(thermal_values)
-
-        # Find the status at peak compute utilization or fallback to most recent
-        if compute_values:
-            peak_compute_snapshot = max(
-                (s for s in history if s.compute_util is not None),
-                key=lambda s: s.compute_util,
-            )
-            peaks["status"] = peak_compute_snapshot.status
-
-        return peaks
-
-    def _get_bottleneck_color(self, bottleneck_type: str) -> str:
-        """Get color for bottleneck type"""
-        colors = {
-            "memory_bound": "cyan",
-            "compute_bound": "blue",
-            "thermal_throttling": "red",
-            "power_limited": "yellow",
-            "balanced": "green",
-            "idle": "dim",
-            "unknown": "white",
-        }
-        return colors.get(bottleneck_type, "white")
-
-    def _get_bottleneck_explanation(self, bottleneck_type: str) -> str:
-        """Get human-readable explanation for bottleneck type"""
-        explanations = {
-            "memory_bound": "Memory subsystem is the limiting factor",
-            "compute_bound": "GPU cores are the limiting factor",
-            "thermal_throttling": "Temperature too high, reducing performance",
-            "power_limited": "Power draw at limit, reducing performance",
-            "balanced": "GPU and memory working efficiently together",
-            "idle": "No significant workload detected",
-            "unknown": "Workload pattern unclear",
-        }
-        return explanations.get(bottleneck_type, "Unknown bottleneck")
+        self._tables[device.index] = (layout, table, rows)
+        return table, rows
 
 
 class PeakMetrics(Static):
     """Display peak metrics from history"""
 
-    def __init__(self, metrics_widget):
+    def __init__(self, state: GpuState):
         super().__init__()
-        self.metrics_widget = metrics_widget
+        self.state = state
+        self._timer = None
 
     def on_mount(self) -> None:
-        self.set_interval(UPDATE_INTERVAL, self.update_peaks)
+        self._timer = self.set_interval(UPDATE_INTERVAL, self.update_peaks, pause=True)
+
+    def on_show(self) -> None:
+        if self._timer:
+            self._timer.resume()
+            self.update_peaks()
+
+    def on_hide(self) -> None:
+        # History keeps recording on the sampler thread while hidden
+        if self._timer:
+            self._timer.pause()
 
     def update_peaks(self) -> None:
         """Update peak metrics display"""
-        if not self.metrics_widget.monitors:
+        if not self.state.devices:
             self.update("[yellow]No peak data available[/yellow]")
             return
 
         try:
-            current_time = time()
             panels = []
 
-            for device_index, monitor in self.metrics_widget.monitors:
-                peaks = self.metrics_widget._get_peaks(device_index, current_time)
+            for device in self.state.devices:
+                peaks = self.state.get_peaks(device.index)
 
                 if not peaks:
                     continue
 
-                _, analyzer = self.metrics_widget.device_map.get(device_index, (None, None))
+                monitor, analyzer = device.monitor, device.analyzer
 
                 table = Table(show_header=False, box=None, padding=(0, 1))
                 table.add_column("Metric", style="cyan")
@@ -385,9 +397,9 @@ class PeakMetrics(Static):
                     table.add_row("Thermal", f"{thermal_bar} {peaks['thermal_percent']:.0f}%")
 
                 # Status at peak (if available)
-                if "status" in peaks and peaks["status"]:
-                    bottleneck_color = self.metrics_widget._get_bottleneck_color(peaks["status"])
-                    explanation = self.metrics_widget._get_bottleneck_explanation(peaks["status"])
+                if "status" in peaks:
+                    bottleneck_color = _bottleneck_color(peaks["status"])
+                    explanation = _bottleneck_explanation(peaks["status"])
                     table.add_row("", "")
                     table.add_row(
                         "Peak Status",
@@ -397,13 +409,11 @@ class PeakMetrics(Static):
 
                 # Power
                 if peaks["power_usage"] > 0:
-                    # Try to get power limit from current metrics
-                    m = monitor.get_current_metrics()
-                    if m.power_limit:
-                        power_bar = _make_bar(peaks["power_usage"], m.power_limit)
+                    if monitor.power_limit:
+                        power_bar = _make_bar(peaks["power_usage"], monitor.power_limit)
                         table.add_row(
                             "Power",
-                            f"{power_bar} {peaks['power_usage']:.1f}W / {m.power_limit:.1f}W",
+                            f"{power_bar} {peaks['power_usage']:.1f}W / {monitor.power_limit:.1f}W",
                         )
                     else:
                         table.add_row("Power", f"{peaks['power_usage']:.1f}W")
@@ -428,23 +438,19 @@ class PeakMetrics(Static):
                 table.add_row("Memory Utilization", f"{mem_bar} {peaks['memory_utilization']}%")
 
                 # Memory Used
-                m = monitor.get_current_metrics()
-                vram_bar = _make_bar(peaks["memory_used"], m.memory_total)
+                vram_bar = _make_bar(peaks["memory_used"], monitor.memory_total)
                 table.add_row(
                     "Memory Used",
-                    f"{vram_bar} {peaks['memory_used'] / (1024**3):.1f} / {m.memory_total / (1024**3):.1f} GB",
+                    f"{vram_bar} {peaks['memory_used'] / (1024**3):.1f} / {monitor.memory_total / (1024**3):.1f} GB",
                 )
 
                 # Clocks
                 table.add_row("GPU Clock", f"{peaks['device_clock']} MHz")
                 table.add_row("Memory Clock", f"{peaks['memory_clock']} MHz")
 
-                device_name = self.metrics_widget.device_names.get(
-                    device_index, f"GPU {device_index}"
-                )
                 panel = Panel(
                     table,
-                    title=f"{device_name} Peak Values (last 60s)",
+                    title=f"{device.name} Peak Values (last {self.state.window_ticks * UPDATE_INTERVAL:g}s)",
                     border_style="yellow",
                 )
                 panels.append(panel)
@@ -490,22 +496,30 @@ class App(TextualApp):
         ("q", "quit", "Quit"),
     ]
 
+    def __init__(self):
+        super().__init__()
+        # One sampler and history shared by every tab
+        self.state = GpuState(UPDATE_INTERVAL, PEAK_WINDOW)
+
     def compose(self) -> ComposeResult:
         yield Header()
 
-        # Create metrics widget to share history with peak metrics
-        metrics_widget = Metrics()
+        self.state.start()
 
         with TabbedContent():
             with TabPane("Overview", id="overview"):
                 yield DeviceList()
-                yield metrics_widget
+                yield Metrics(self.state)
             with TabPane("History", id="history"):
-                yield PeakMetrics(metrics_widget)
+                yield PeakMetrics(self.state)
             with TabPane("Settings", id="settings"):
                 yield Static("[dim]Settings coming soon[/dim]", classes="placeholder")
         yield Footer()
 
+    def on_unmount(self) -> None:
+        """Stop background sampling"""
+        self.state.stop()
+
     def action_quit(self) -> None:
         """Quit the application"""
         self.exit()
@@ -1,8 +1,42 @@
 """GPU detection and information utilities"""
 
+import atexit
+import ctypes.util
+import math
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, partial
+from time import monotonic
 
-import pynvml as nvml
+# pynvml, imported by the first initialize() so importing this module stays cheap
+nvml = None
+
+# Most threads used to query devices concurrently while listing
+MAX_LIST_WORKERS = 8
+
+# Seconds a device listing is reused, the set of GPUs does not change at runtime
+DEFAULT_LIST_TTL = 60.0
+
+
+def _list_ttl() -> float:
+    """Listing TTL from the environment, non-negative"""
+    try:
+        ttl = float(os.getenv("NVSONAR_LIST_TTL", DEFAULT_LIST_TTL))
+    except ValueError:
+        return DEFAULT_LIST_TTL
+    if not math.isfinite(ttl):
+        return DEFAULT_LIST_TTL
+    return max(ttl, 0.0)
+
+
+LIST_TTL = _list_ttl()
+
+# Backoff bounds in seconds between nvmlInit attempts after a failure
+INIT_RETRY_MIN = 1.0
+INIT_RETRY_MAX = 300.0
 
 
 def _decode_if_bytes(value: str | bytes) -> str:
@@ -10,9 +44,45 @@ def _decode_if_bytes(value: str | bytes) -> str:
     return value.decode("utf-8") if isinstance(value, bytes) else value
 
 
-@dataclass
+# String decoder for NVML results. Whether pynvml returns bytes or str is
+# fixed per library version, so it is detected once NVML is up.
+_decode = _decode_if_bytes
+
+
+@lru_cache(maxsize=1)
+def _driver_present() -> bool:
+    """Cheap check for an NVIDIA driver, so hosts without one skip loading NVML"""
+    if sys.platform.startswith("linux"):
+        # /dev/dxg is how WSL2 exposes the GPU, without the usual device nodes
+        return os.path.exists("/dev/nvidiactl") or os.path.exists("/dev/dxg")
+    return ctypes.util.find_library("nvml" if sys.platform == "win32" else "nvidia-ml") is not None
+
+
+def _load_nvml() -> bool:
+    """Import pynvml on first use"""
+    global nvml
+    if nvml is None:
+        try:
+            import pynvml
+        except ImportError:
+            return False
+        nvml = pynvml
+    return True
+
+
+def _bind_decoder() -> None:
+    """Replace the generic decoder with one matching this pynvml"""
+    global _decode
+    try:
+        sample = nvml.nvmlSystemGetDriverVersion()
+    except nvml.NVMLError:
+        return
+    _decode = partial(bytes.decode, encoding="utf-8") if isinstance(sample, bytes) else str
+
+
+@dataclass(slots=True, frozen=True)
 class Info:
-    """GPU device information"""
+    """GPU device information, fixed for the lifetime of the NVML session"""
 
     index: int
     name: str
@@ -24,21 +94,60 @@ class Info:
 
 
 class _NVMLContext:
-    """NVML library context"""
+    """NVML library context
+
+    NVML is initialized at most once per process and shut down at exit.
+    Failed initialization is retried with exponential backoff so callers
+    polling initialize() do not hammer nvmlInit.
+    """
 
     def __init__(self):
         self._initialized = False
+        self._lock = threading.Lock()
+        self._retry_delay = INIT_RETRY_MIN
+        self._retry_at = 0.0
 
     def initialize(self) -> bool:
         if self._initialized:
             return True
 
-        try:
-            nvml.nvmlInit()
+        # Without a driver nvmlInit can never succeed, and the answer is cached
+        if not _driver_present():
+            return False
+
+        with self._lock:
+            # Another thread may have finished while we waited
+            if self._initialized:
+                return True
+
+            now = monotonic()
+            if now < self._retry_at:
+                return False
+
+            if not _load_nvml():
+                self._back_off(now)
+                return False
+
+            try:
+                nvml.nvmlInit()
+            except nvml.NVMLError:
+                self._back_off(now)
+                return False
+
+            atexit.register(self._shutdown)
+            _bind_decoder()
             self._initialized = True
             return True
+
+    def _back_off(self, now: float) -> None:
+        self._retry_at = now + self._retry_delay
+        self._retry_delay = min(self._retry_delay * 2, INIT_RETRY_MAX)
+
+    def _shutdown(self) -> None:
+        try:
+            nvml.nvmlShutdown()
         except nvml.NVMLError:
-            return False
+            pass
 
     @property
     def is_initialized(self) -> bool:
@@ -52,13 +161,146 @@ def initialize() -> bool:
     return _nvml_context.initialize()
 
 
+# Device handles stay valid for the NVML session, which lasts the whole process.
+# Keyed by physical NVML index.
+_handle_cache: dict[int, object] = {}
+
+
+def _get_physical_handle(physical_index: int):
+    """Get the NVML handle for a physical device, looking it up only once"""
+    handle = _handle_cache.get(physical_index)
+    if handle is None:
+        handle = _handle_cache[physical_index] = nvml.nvmlDeviceGetHandleByIndex(physical_index)
+    return handle
+
+
+def _get_handle(device_index: int):
+    """Get the NVML handle for a device index as seen through CUDA_VISIBLE_DEVICES"""
+    visible = _visible_devices()
+    if visible is None:
+        return _get_physical_handle(device_index)
+
+    if not 0 <= device_index < len(visible):
+        raise nvml.NVMLError(nvml.NVML_ERROR_INVALID_ARGUMENT)
+    return _get_physical_handle(visible[device_index])
+
+
+def _hides_all_devices() -> bool:
+    """Whether CUDA_VISIBLE_DEVICES is set but empty, so no GPU can be used"""
+    value = os.environ.get("CUDA_VISIBLE_DEVICES")
+    return value is not None and not value.strip()
+
+
+def _parse_visible_devices() -> list[int] | None:
+    """Physical indices listed in CUDA_VISIBLE_DEVICES, None to show every device
+
+    Entries are device ordinals, GPU UUID prefixes or MIG UUIDs, which map to
+    their parent GPU. Like the CUDA runtime, parsing stops at the first entry
+    that is invalid, ambiguous or repeated.
+
+    CUDA numbers devices fastest first unless CUDA_DEVICE_ORDER=PCI_BUS_ID,
+    while NVML uses PCI order. The two only agree when every GPU is the same
+    model, so ordinals on mixed hosts, and MIG UUIDs NVML cannot resolve,
+    fall back to showing all devices rather than guessing.
+    """
+    value = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if value is None:
+        return None
+
+    count = nvml.nvmlDeviceGetCount()
+    uuids = None
+    ordinals_match = None
+    visible = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if entry.startswith("MIG-"):
+            physical_index = _mig_parent_index(entry)
+            if physical_index is None:
+                return None
+            # Several MIG slices of one GPU all show up as that GPU
+            if physical_index not in visible:
+                visible.append(physical_index)
+            continue
+
+        if entry.startswith("GPU-"):
+            if uuids is None:
+                uuids = _physical_uuids(count)
+            matches = [i for i, uuid in enumerate(uuids) if uuid.startswith(entry)]
+            if len(matches) != 1:
+                break
+            physical_index = matches[0]
+        else:
+            try:
+                physical_index = int(entry)
+            except ValueError:
+                break
+            if not 0 <= physical_index < count:
+                break
+            if ordinals_match is None:
+                ordinals_match = _ordinals_match_nvml(count)
+            if not ordinals_match:
+                return None
+
+        if physical_index in visible:
+            break
+        visible.append(physical_index)
+
+    return visible
+
+
+def _physical_uuids(count: int) -> list[str]:
+    """UUIDs of all physical devices, in NVML order"""
+    return [_decode(nvml.nvmlDeviceGetUUID(_get_physical_handle(i))) for i in range(count)]
+
+
+def _ordinals_match_nvml(count: int) -> bool:
+    """Whether CUDA device ordinals are the same as NVML indices"""
+    if os.environ.get("CUDA_DEVICE_ORDER") == "PCI_BUS_ID":
+        return True
+
+    # Fastest first keeps PCI order between identical GPUs
+    names = {nvml.nvmlDeviceGetName(_get_physical_handle(i)) for i in range(count)}
+    return len(names) <= 1
+
+
+def _mig_parent_index(entry: str) -> int | None:
+    """Physical index of the GPU a MIG device belongs to, None if unknown"""
+    # Pre-R470 form MIG-GPU-<uuid>/<gi>/<ci> embeds the parent UUID
+    if entry.startswith("MIG-GPU-"):
+        parent_uuid = entry[len("MIG-") :].split("/")[0]
+        matches = [
+            i
+            for i, uuid in enumerate(_physical_uuids(nvml.nvmlDeviceGetCount()))
+            if uuid.startswith(parent_uuid)
+        ]
+        return matches[0] if len(matches) == 1 else None
+
+    try:
+        mig_handle = nvml.nvmlDeviceGetHandleByUUID(entry)
+        parent_handle = nvml.nvmlDeviceGetDeviceHandleFromMigDeviceHandle(mig_handle)
+        return nvml.nvmlDeviceGetIndex(parent_handle)
+    except nvml.NVMLError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _visible_devices() -> list[int] | None:
+    """Cached logical to physical index mapping, raising NVMLError so failures are not cached"""
+    return _parse_visible_devices()
+
+
 def get_device_count() -> int:
-    """Get number of available GPUS"""
+    """Get number of GPUs visible to this process"""
+    # Nothing is visible, so there is no need for NVML at all
+    if _hides_all_devices():
+        return 0
+
     if not _nvml_context.is_initialized:
         return 0
 
     try:
-        return nvml.nvmlDeviceGetCount()
+        visible = _visible_devices()
+        return nvml.nvmlDeviceGetCount() if visible is None else len(visible)
     except nvml.NVMLError:
         return 0
 
@@ -69,44 +311,96 @@ def get_device_info(device_index: int = 0) -> Info | None:
         return None
 
     try:
-        handle = nvml.nvmlDeviceGetHandleByIndex(device_index)
+        return _get_static_info(device_index, _driver_version(), _cuda_version_str())
+    except nvml.NVMLError:
+        return None
 
-        name = _decode_if_bytes(nvml.nvmlDeviceGetName(handle))
-        uuid = _decode_if_bytes(nvml.nvmlDeviceGetUUID(handle))
-        memory_info = nvml.nvmlDeviceGetMemoryInfo(handle)
 
-        driver_version = _decode_if_bytes(nvml.nvmlSystemGetDriverVersion())
+@lru_cache(maxsize=1)
+def _driver_version() -> str:
+    """Driver version, shared by all devices"""
+    return _decode(nvml.nvmlSystemGetDriverVersion())
 
-        cuda_version = nvml.nvmlSystemGetCudaDriverVersion()
-        cuda_version_str = f"{cuda_version // 1000}.{(cuda_version % 1000) // 10}"
 
-        pci_info = nvml.nvmlDeviceGetPciInfo(handle)
-        pci_bus_id = _decode_if_bytes(pci_info.busId)
+@lru_cache(maxsize=1)
+def _cuda_version_str() -> str:
+    """CUDA driver version formatted as major.minor, shared by all devices"""
+    cuda_version = nvml.nvmlSystemGetCudaDriverVersion()
+    return f"{cuda_version // 1000}.{(cuda_version % 1000) // 10}"
+
+
+@lru_cache(maxsize=None)
+def _get_static_info(device_index: int, driver_version: str, cuda_version: str) -> Info:
+    """Query device information once, raising NVMLError so failures are not cached"""
+    return _build_info(_get_handle(device_index), device_index, driver_version, cuda_version)
 
-        return Info(
-            index=device_index,
-            name=name,
-            uuid=uuid,
-            memory_total=memory_info.total,
-            driver_version=driver_version,
-            cuda_version=cuda_version_str,
-            pci_bus_id=pci_bus_id,
-        )
-    except nvml.NVMLError:
-        return None
+
+def _build_info(handle, device_index: int, driver_version: str, cuda_version: str) -> Info:
+    """Build device information, issuing only per-device NVML calls"""
+    name = _decode(nvml.nvmlDeviceGetName(handle))
+    uuid = _decode(nvml.nvmlDeviceGetUUID(handle))
+    memory_info = nvml.nvmlDeviceGetMemoryInfo(handle)
+
+    pci_info = nvml.nvmlDeviceGetPciInfo(handle)
+    pci_bus_id = _decode(pci_info.busId)
+
+    return Info(
+        index=device_index,
+        name=name,
+        uuid=uuid,
+        memory_total=memory_info.total,
+        driver_version=driver_version,
+        cuda_version=cuda_version,
+        pci_bus_id=pci_bus_id,
+    )
+
+
+# Last successful listing as (monotonic time, devices)
+_list_cache: tuple[float, list[Info]] | None = None
 
 
 def list_devices() -> list[Info]:
-    """List all available GPUs"""
-    if not _nvml_context.initialize():
+    """List all available GPUs, reusing the last listing for up to LIST_TTL seconds"""
+    global _list_cache
+    now = monotonic()
+    if _list_cache is not None and now - _list_cache[0] < LIST_TTL:
+        return list(_list_cache[1])
+
+    devices = _query_devices()
+    if devices is None:
         return []
 
-    count = get_device_count()
-    devices = []
+    _list_cache = (now, devices)
+    return list(devices)
+
+
+def _query_devices() -> list[Info] | None:
+    """Query all visible GPUs, None if NVML is unavailable"""
+    if _hides_all_devices():
+        return []
 
-    for i in range(count):
-        info = get_device_info(i)
-        if info:
-            devices.append(info)
+    if not _nvml_context.initialize():
+        return None
+
+    # System-wide values are fetched once for the whole listing
+    try:
+        driver_version = _driver_version()
+        cuda_version = _cuda_version_str()
+    except nvml.NVMLError:
+        return None
 
-    return devices
+    def query(device_index: int) -> Info | None:
+        try:
+            return _get_static_info(device_index, driver_version, cuda_version)
+        except nvml.NVMLError:
+            return None
+
+    count = get_device_count()
+    if count <= 1:
+        infos = map(query, range(count))
+    else:
+        # Per-device NVML calls are independent, so overlap their driver round-trips
+        with ThreadPoolExecutor(max_workers=min(count, MAX_LIST_WORKERS)) as executor:
+            infos = list(executor.map(query, range(count)))
+
+    return [info for info in infos if info]
@@ -0,0 +1,10 @@
+"""Tests for the utilization lookup table"""
+
+from nvsonar.core.analyzer import _BOTTLENECK_LUT, _classify_utilization
+
+
+def test_lut_matches_heuristic():
+    for device_util in range(101):
+        for mem_util in range(101):
+            expected = _classify_utilization(device_util, mem_util)
+            assert _BOTTLENECK_LUT[device_util][mem_util] == expected
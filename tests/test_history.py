@@ -0,0 +1,44 @@
+"""Tests for the sliding-window maximum"""
+
+import random
+
+import pytest
+
+from nvsonar.core.history import RollingMax
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    """Peak equals a plain max over the window, with repeated ticks and a capacity"""
+    rng = random.Random(seed)
+    window = rng.randint(1, 10)
+    rolling = RollingMax(window, window + 1)
+    pushed = []
+
+    tick = 0
+    for _ in range(300):
+        tick += rng.choice([0, 0, 1, 1, 2])
+        value = rng.randint(0, 20)
+        rolling.push(tick, value, payload=(tick, value))
+        pushed.append((tick, value))
+        rolling.expire(tick)
+
+        in_window = [v for t, v in pushed if tick - t <= window]
+        assert rolling.peak() == max(in_window)
+        assert rolling.peak_payload()[1] == rolling.peak()
+
+
+def test_empty_window():
+    rolling = RollingMax(5)
+    assert not rolling
+    assert rolling.peak() is None
+    assert rolling.peak_payload() is None
+
+
+def test_expires_old_peak():
+    rolling = RollingMax(2)
+    rolling.push(0, 10, "old")
+    rolling.push(1, 5, "new")
+    rolling.expire(3)
+    assert rolling.peak() == 5
+    assert rolling.peak_payload() == "new"
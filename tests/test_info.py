@@ -0,0 +1,146 @@
+"""Tests for CUDA_VISIBLE_DEVICES parsing"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from nvsonar.utils import info
+
+UUIDS = ["GPU-aaaa1111", "GPU-aaaa2222", "GPU-bbbb3333"]
+MIG_PARENTS = {"MIG-cccc4444": 1, "MIG-dddd5555": 1}
+
+
+class FakeNVMLError(Exception):
+    def __init__(self, value):
+        self.value = value
+
+
+def make_nvml(names):
+    """Minimal pynvml stand-in where a handle is the physical index"""
+
+    def get_handle_by_uuid(uuid):
+        if uuid not in MIG_PARENTS:
+            raise FakeNVMLError(2)
+        return uuid
+
+    return SimpleNamespace(
+        NVMLError=FakeNVMLError,
+        NVML_ERROR_INVALID_ARGUMENT=2,
+        nvmlDeviceGetCount=lambda: len(names),
+        nvmlDeviceGetHandleByIndex=lambda index: index,
+        nvmlDeviceGetUUID=lambda handle: UUIDS[handle],
+        nvmlDeviceGetName=lambda handle: names[handle],
+        nvmlDeviceGetHandleByUUID=get_handle_by_uuid,
+        nvmlDeviceGetDeviceHandleFromMigDeviceHandle=lambda handle: MIG_PARENTS[handle],
+        nvmlDeviceGetIndex=lambda handle: handle,
+    )
+
+
+@pytest.fixture
+def nvml(monkeypatch):
+    """Three identical GPUs behind a fake NVML"""
+    monkeypatch.setattr(info, "nvml", make_nvml(["A100"] * 3))
+    monkeypatch.setattr(info, "_decode", str)
+    monkeypatch.setattr(info, "_handle_cache", {})
+    monkeypatch.delenv("CUDA_VISIBLE_DEVICES", raising=False)
+    monkeypatch.delenv("CUDA_DEVICE_ORDER", raising=False)
+    return monkeypatch
+
+
+def test_unset_shows_all_devices(nvml):
+    assert info._parse_visible_devices() is None
+
+
+@pytest.mark.parametrize("value", ["", " "])
+def test_empty_hides_all_devices(nvml, value):
+    nvml.setenv("CUDA_VISIBLE_DEVICES", value)
+    assert info._hides_all_devices()
+
+
+def test_unset_does_not_hide_devices(nvml):
+    assert not info._hides_all_devices()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("0", [0]),
+        ("2,0", [2, 0]),
+        (" 1 , 2 ", [1, 2]),
+        ("0,x,1", [0]),
+        ("1,3,0", [1]),
+        ("-1,0", []),
+    ],
+)
+def test_ordinals(nvml, value, expected):
+    nvml.setenv("CUDA_VISIBLE_DEVICES", value)
+    assert info._parse_visible_devices() == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("GPU-bbbb", [2]),
+        ("GPU-aaaa2222,0", [1, 0]),
+        ("GPU-aaaa,1", []),
+        ("GPU-ffff,1", []),
+    ],
+)
+def test_uuid_prefixes(nvml, value, expected):
+    nvml.setenv("CUDA_VISIBLE_DEVICES", value)
+    assert info._parse_visible_devices() == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1,1,0", [1]),
+        ("GPU-aaaa2222,1,0", [1]),
+        ("2,GPU-bbbb", [2]),
+    ],
+)
+def test_duplicates_stop_parsing(nvml, value, expected):
+    nvml.setenv("CUDA_VISIBLE_DEVICES", value)
+    assert info._parse_visible_devices() == expected
+
+
+def test_mig_devices_map_to_parent_gpu(nvml):
+    nvml.setenv("CUDA_VISIBLE_DEVICES", "MIG-cccc4444,MIG-dddd5555")
+    assert info._parse_visible_devices() == [1]
+
+
+def test_legacy_mig_form_maps_to_parent_gpu(nvml):
+    nvml.setenv("CUDA_VISIBLE_DEVICES", "MIG-GPU-bbbb3333/1/0")
+    assert info._parse_visible_devices() == [2]
+
+
+def test_unknown_mig_device_shows_all_devices(nvml):
+    nvml.setenv("CUDA_VISIBLE_DEVICES", "MIG-eeee6666")
+    assert info._parse_visible_devices() is None
+
+
+def test_ordinals_on_mixed_gpus_show_all_devices(nvml):
+    nvml.setattr(info, "nvml", make_nvml(["A100", "T4", "T4"]))
+    nvml.setenv("CUDA_VISIBLE_DEVICES", "1")
+    assert info._parse_visible_devices() is None
+
+
+def test_ordinals_on_mixed_gpus_with_pci_order(nvml):
+    nvml.setattr(info, "nvml", make_nvml(["A100", "T4", "T4"]))
+    nvml.setenv("CUDA_VISIBLE_DEVICES", "1")
+    nvml.setenv("CUDA_DEVICE_ORDER", "PCI_BUS_ID")
+    assert info._parse_visible_devices() == [1]
+
+
+def test_uuids_on_mixed_gpus(nvml):
+    nvml.setattr(info, "nvml", make_nvml(["A100", "T4", "T4"]))
+    nvml.setenv("CUDA_VISIBLE_DEVICES", "GPU-bbbb")
+    assert info._parse_visible_devices() == [2]
+
+
+def test_empty_value_skips_nvml(monkeypatch):
+    monkeypatch.setattr(info, "nvml", None)
+    monkeypatch.setattr(info, "_list_cache", None)
+    monkeypatch.setenv("CUDA_VISIBLE_DEVICES", "")
+    assert info.get_device_count() == 0
+    assert info.list_devices() == []
@@ -0,0 +1,36 @@
+"""Tests for the sampler's idle backoff"""
+
+from nvsonar.core.sampler import MAX_IDLE_INTERVAL, MetricSampler
+
+
+def test_idle_backoff_sequence():
+    sampler = MetricSampler([], interval=1.0)
+    intervals = []
+    for all_idle in [True, True, True, True, False]:
+        sampler._update_interval(all_idle)
+        intervals.append(sampler.current_interval)
+    assert intervals == [2.0, 4.0, MAX_IDLE_INTERVAL, MAX_IDLE_INTERVAL, 1.0]
+
+
+def test_backoff_restarts_after_activity():
+    sampler = MetricSampler([], interval=1.0)
+    for all_idle in [True, True, False, True]:
+        sampler._update_interval(all_idle)
+    assert sampler.current_interval == 2.0
+
+
+def test_slow_interval_never_backs_off():
+    sampler = MetricSampler([], interval=10.0)
+    sampler._update_interval(True)
+    assert sampler.current_interval == 10.0
+
+
+def test_sample_records_errors():
+    """A failing hook is recorded rather than raised"""
+
+    def fail():
+        raise AttributeError("boom")
+
+    sampler = MetricSampler([], interval=1.0, before_sample=fail)
+    sampler.sample()
+    assert isinstance(sampler.error, AttributeError)